@@ -5,96 +5,544 @@ import time
 import datetime
 import hashlib
 import tarfile
+import gzip
+import tempfile
+import io
+import stat
+import queue
 import shutil
+import subprocess
 import threading
+import contextlib
 import json
+import sqlite3
 import logging
+import functools
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QLineEdit, QFileDialog, QCheckBox, QSlider, QComboBox,
+                             QPushButton, QLineEdit, QFileDialog, QCheckBox, QComboBox,
                              QSpinBox, QListWidget, QTextEdit, QProgressBar, QLabel, QFrame, QMessageBox)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtGui import QFont
 
-class BackupWorker(QThread):
+try:
+    import pwd
+    import grp
+except ImportError:
+    pwd = grp = None
+
+HASHERS = {"sha256": hashlib.sha256}
+try:
+    import blake3
+    HASHERS["blake3"] = blake3.blake3
+except ImportError:
+    pass
+try:
+    import xxhash
+    HASHERS["xxh64"] = xxhash.xxh64
+except ImportError:
+    pass
+DEFAULT_CHECKSUM_ALGO = "blake3" if "blake3" in HASHERS else "sha256"
+
+SNAPSHOT_EXTENSION = ".snapshot.json"
+BACKUP_EXTENSIONS = (".tar.gz", ".tar.zst", SNAPSHOT_EXTENSION)
+INDEX_SUFFIX = ".index.json"
+OBJECTS_DIR = "objects"
+UI_UPDATE_INTERVAL = 0.033
+COPY_BUFSIZE = 1024 * 1024
+READ_AHEAD_QUEUE = 8
+READ_AHEAD_LIMIT = 1024 * 1024
+COMPRESSION_PRESETS = {"fast": (3, 3), "balanced": (9, 6), "max": (19, 9)}
+DEFAULT_COMPRESSION_PRESET = "fast"
+
+def _find_compressor(preset):
+    zstd_level, gzip_level = COMPRESSION_PRESETS[preset]
+    zstd = shutil.which("zstd")
+    if zstd:
+        return [zstd, "-c", "-q", "-T0", f"-{zstd_level}"], ".tar.zst"
+    pigz = shutil.which("pigz")
+    if pigz:
+        return [pigz, "-c", "-p", str(os.cpu_count() or 1), f"-{gzip_level}"], ".tar.gz"
+    return None, ".tar.gz"
+
+@contextlib.contextmanager
+def _open_backup(backup_file):
+    if not backup_file.endswith(".tar.zst"):
+        with open(backup_file, 'rb', buffering=COPY_BUFSIZE) as raw, \
+                tarfile.open(fileobj=raw, mode="r|gz", bufsize=COPY_BUFSIZE, copybufsize=COPY_BUFSIZE) as tar:
+            yield tar
+        return
+    zstd = shutil.which("zstd")
+    if not zstd:
+        raise Exception("zstd is required to read .tar.zst backups")
+    proc = subprocess.Popen([zstd, "-d", "-c", "-q", backup_file], stdout=subprocess.PIPE,
+                            bufsize=COPY_BUFSIZE)
+    try:
+        with tarfile.open(fileobj=proc.stdout, mode="r|", bufsize=COPY_BUFSIZE,
+                          copybufsize=COPY_BUFSIZE) as tar:
+            yield tar
+        # Callers may stop early (e.g. after the leading manifest), which ends zstd with SIGPIPE.
+        drained = not proc.stdout.read(1)
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    if drained and proc.returncode != 0:
+        raise Exception(f"zstd exited with status {proc.returncode}")
+
+def _object_path(objects_dir, digest):
+    return os.path.join(objects_dir, digest[:2], digest[2:])
+
+def _store_object(objects_dir, file_path, level):
+    with open(file_path, 'rb') as src:
+        digest = _hash_file(src, "sha256")
+        if os.path.exists(_object_path(objects_dir, digest)):
+            return digest
+        src.seek(0)
+        hasher = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=objects_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=level, mtime=0) as gz:
+                    for chunk in iter(lambda: src.read(COPY_BUFSIZE), b''):
+                        hasher.update(chunk)
+                        gz.write(chunk)
+            digest = hasher.hexdigest()
+            object_path = _object_path(objects_dir, digest)
+            if os.path.exists(object_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                os.replace(tmp_path, object_path)
+            return digest
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+_read_buffers = threading.local()
+
+def _hash_file(f, algo):
+    if algo not in HASHERS:
+        raise Exception(f"Checksum algorithm {algo} is not available")
+    hasher = HASHERS[algo]()
+    buf = getattr(_read_buffers, "buf", None)
+    if buf is None:
+        buf = _read_buffers.buf = bytearray(COPY_BUFSIZE)
+    view = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        hasher.update(view[:n])
+    return hasher.hexdigest()
+
+def _manifest_entry(entry):
+    if isinstance(entry, dict):
+        modified = datetime.datetime.fromisoformat(entry["modified"]).timestamp()
+        return entry.get("checksum"), entry["size"], int(modified * 1e9), None
+    checksum, size, mtime, *mode = entry
+    return checksum, size, mtime, mode[0] if mode else None
+
+def _tail_lines(path, count, block_size=64 * 1024):
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        while pos > 0 and data.count(b'\n') <= count:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return b'\n'.join(data.splitlines()[-count:]).decode('utf-8', 'replace')
+
+def _archive_names(folder, file_path):
+    folder_path = Path(folder)
+    rel_path = os.path.relpath(file_path, folder_path.parent)
+    short_path = os.path.join(folder_path.name, os.path.relpath(file_path, folder))
+    return rel_path, short_path
+
+def _walk(root):
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            else:
+                yield entry.path, entry.stat(follow_symlinks=False)
+
+def _enumerate(folders):
+    if len(folders) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(folders))) as pool:
+            walked = list(pool.map(lambda folder: list(_walk(folder)), folders))
+    else:
+        walked = [list(_walk(folder)) for folder in folders]
+    return [(folder, path, st) for folder, files in zip(folders, walked) for path, st in files]
+
+@functools.lru_cache(maxsize=None)
+def _owner_names(uid, gid):
+    uname = gname = ""
+    if pwd:
+        try:
+            uname = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            pass
+        try:
+            gname = grp.getgrgid(gid).gr_name
+        except KeyError:
+            pass
+    return uname, gname
+
+def _add_manifest(tar, manifest):
+    manifest_content = json.dumps(manifest, separators=(',', ':')).encode()
+    tarinfo = tarfile.TarInfo("manifest.json")
+    tarinfo.size = len(manifest_content)
+    tarinfo.mtime = int(time.time())
+    tar.addfile(tarinfo, io.BytesIO(manifest_content))
+
+def _tarinfo(path, arcname, st):
+    tarinfo = tarfile.TarInfo(arcname)
+    if stat.S_ISREG(st.st_mode):
+        tarinfo.size = st.st_size
+    elif stat.S_ISLNK(st.st_mode):
+        tarinfo.type = tarfile.SYMTYPE
+        tarinfo.linkname = os.readlink(path)
+    else:
+        return None
+    tarinfo.mode = stat.S_IMODE(st.st_mode)
+    tarinfo.uid = st.st_uid
+    tarinfo.gid = st.st_gid
+    tarinfo.uname, tarinfo.gname = _owner_names(st.st_uid, st.st_gid)
+    tarinfo.mtime = st.st_mtime
+    return tarinfo
+
+class _FixedSizeReader:
+    def __init__(self, fileobj, size, name, hasher=None):
+        self.fileobj = fileobj
+        self.remaining = size
+        self.name = name
+        self.hasher = hasher
+        self.shrank = False
+
+    def read(self, size):
+        size = min(size, self.remaining)
+        data = self.fileobj.read(size)
+        if len(data) < size:
+            if not self.shrank:
+                self.shrank = True
+                logging.warning(f"{self.name} shrank while being archived, padding with zeros")
+            data += bytes(size - len(data))
+        if self.hasher:
+            self.hasher.update(data)
+        self.remaining -= size
+        return data
+
+    def close(self):
+        self.fileobj.close()
+
+class ChecksumCache:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = None
+        self.disabled = False
+        self.pending = {}
+
+    def connect(self):
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS file_checksums "
+                              "(path TEXT, algo TEXT, size INTEGER, mtime_ns INTEGER, digest TEXT, "
+                              "PRIMARY KEY (path, algo))")
+        return self.conn
+
+    def get(self, path, algo, st):
+        with self.lock:
+            if self.disabled:
+                return None
+            row = self.pending.get((path, algo))
+            if row is None:
+                try:
+                    row = self.connect().execute(
+                        "SELECT size, mtime_ns, digest FROM file_checksums WHERE path = ? AND algo = ?",
+                        (path, algo)).fetchone()
+                except sqlite3.Error as e:
+                    logging.warning(f"Checksum cache unavailable: {str(e)}")
+                    self.disabled = True
+                    return None
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return row[2]
+        return None
+
+    def put(self, path, algo, st, digest):
+        with self.lock:
+            if not self.disabled:
+                self.pending[(path, algo)] = (st.st_size, st.st_mtime_ns, digest)
+
+    def flush(self):
+        with self.lock:
+            if self.disabled or not self.pending:
+                return
+            try:
+                conn = self.connect()
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO file_checksums VALUES (?, ?, ?, ?, ?)",
+                                     [key + row for key, row in self.pending.items()])
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to update checksum cache: {str(e)}")
+                self.disabled = True
+            self.pending.clear()
+
+class WorkerThread(QThread):
     progress = pyqtSignal(int)
     status = pyqtSignal(str)
     error = pyqtSignal(str)
     completed = pyqtSignal(str)
 
-    def __init__(self, app, backup_name, dest, folders, compression_level, calculate_checksums):
+    def __init__(self):
+        super().__init__()
+        self._last_emit = 0.0
+
+    def report(self, message, progress=None):
+        now = time.monotonic()
+        if now - self._last_emit < UI_UPDATE_INTERVAL:
+            return
+        self._last_emit = now
+        self.status.emit(message)
+        if progress is not None:
+            self.progress.emit(progress)
+
+class BackupWorker(WorkerThread):
+    def __init__(self, app, backup_name, dest, folders, compression_preset, calculate_checksums,
+                 incremental=False, checksum_algo=DEFAULT_CHECKSUM_ALGO):
         super().__init__()
         self.app = app
         self.backup_name = backup_name
         self.dest = dest
         self.folders = folders
-        self.compression_level = compression_level
+        self.compression_preset = compression_preset
+        self.gzip_level = COMPRESSION_PRESETS[compression_preset][1]
         self.calculate_checksums = calculate_checksums
+        self.incremental = incremental
+        self.checksum_algo = checksum_algo
 
     def run(self):
         try:
-            backup_file = os.path.join(self.dest, f"{self.backup_name}.tar.gz")
-            self.status.emit(f"Starting backup to {backup_file}...")
-            self.progress.emit(0)
+            with self.app.backup_lock:
+                if self.incremental:
+                    compressor, extension = None, SNAPSHOT_EXTENSION
+                else:
+                    compressor, extension = _find_compressor(self.compression_preset)
+                backup_file = os.path.join(self.dest, f"{self.backup_name}{extension}")
+                self.status.emit(f"Starting backup to {backup_file}...")
+                self.progress.emit(0)
 
-            manifest = {
-                "created": datetime.datetime.now().isoformat(),
-                "folders": self.folders,
-                "files": {}
-            }
-
-            total_files = 0
-            for folder in self.folders:
-                for root, _, files in os.walk(folder):
-                    total_files += len(files)
-
-            processed_files = 0
-
-            with tarfile.open(backup_file, f"w:gz", compresslevel=self.compression_level) as tar:
-                for folder in self.folders:
-                    folder_path = Path(folder)
-                    base_name = folder_path.name
-                    for root, _, files in os.walk(folder):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            rel_path = os.path.relpath(file_path, folder_path.parent)
-                            short_path = os.path.join(base_name, os.path.relpath(file_path, folder))
-                            self.status.emit(f"Adding: {short_path}")
-                            tar.add(file_path, arcname=rel_path)
-
-                            if self.calculate_checksums:
-                                checksum = self.app.calculate_checksum(file_path)
-                                manifest["files"][rel_path] = {
-                                    "checksum": checksum,
-                                    "size": os.path.getsize(file_path),
-                                    "modified": datetime.datetime.fromtimestamp(
-                                        os.path.getmtime(file_path)).isoformat()
-                                }
-
-                            processed_files += 1
-                            progress = int(processed_files / total_files * 100)
-                            self.progress.emit(progress)
-
-                manifest_content = json.dumps(manifest, indent=2)
-                manifest_file = os.path.join(self.dest, "manifest.json")
-                with open(manifest_file, 'w') as f:
-                    f.write(manifest_content)
-                tar.add(manifest_file, arcname="manifest.json")
-                os.unlink(manifest_file)
-
-            self.app.manage_retention()
-            self.progress.emit(100)
-            self.completed.emit(f"Backup completed: {backup_file}")
+                entries = _enumerate(self.folders)
+
+                if self.incremental:
+                    manifest = self.write_snapshot(backup_file, entries)
+                else:
+                    manifest = self.build_manifest(entries)
+                    self.app.checksum_cache.flush()
+                    self.write_tarball(backup_file, compressor, entries, manifest)
+
+                index = {
+                    "created": manifest["created"],
+                    "top_dirs": sorted({Path(folder).name for folder, _, _ in entries}),
+                    "files": len(manifest["files"]),
+                    "size": sum(_manifest_entry(entry)[1] for entry in manifest["files"].values())
+                }
+                with open(backup_file + INDEX_SUFFIX, 'w') as f:
+                    json.dump(index, f, separators=(',', ':'))
+
+                self.app.manage_retention()
+                self.progress.emit(100)
+                self.completed.emit(f"Backup completed: {backup_file}")
         except Exception as e:
             error_msg = f"Backup failed: {str(e)}"
             self.error.emit(error_msg)
 
-class RestoreWorker(QThread):
-    progress = pyqtSignal(int)
-    status = pyqtSignal(str)
-    error = pyqtSignal(str)
-    completed = pyqtSignal(str)
+    def write_tarball(self, backup_file, compressor, entries, manifest):
+        if compressor:
+            with open(backup_file, "wb") as out:
+                proc = subprocess.Popen(compressor, stdin=subprocess.PIPE, stdout=out,
+                                        bufsize=COPY_BUFSIZE)
+                try:
+                    with tarfile.open(fileobj=proc.stdin, mode="w|", bufsize=COPY_BUFSIZE,
+                                      copybufsize=COPY_BUFSIZE) as tar:
+                        self.write_archive(tar, entries, manifest)
+                finally:
+                    proc.stdin.close()
+                    proc.wait()
+            if proc.returncode != 0:
+                raise Exception(f"{os.path.basename(compressor[0])} exited with status {proc.returncode}")
+        else:
+            with open(backup_file, 'wb', buffering=COPY_BUFSIZE) as raw, \
+                    gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=self.gzip_level) as gz, \
+                    tarfile.open(fileobj=gz, mode="w|", bufsize=COPY_BUFSIZE, copybufsize=COPY_BUFSIZE) as tar:
+                self.write_archive(tar, entries, manifest)
+
+    def write_snapshot(self, backup_file, entries):
+        objects_dir = os.path.join(self.dest, OBJECTS_DIR)
+        os.makedirs(objects_dir, exist_ok=True)
+        previous = self.app.load_latest_snapshot(self.dest)
+        manifest = {
+            "created": datetime.datetime.now().isoformat(),
+            "folders": self.folders,
+            "checksum_algo": "sha256",
+            "files": {},
+            "links": {}
+        }
+        files = [(folder, file_path, st) for folder, file_path, st in entries if stat.S_ISREG(st.st_mode)]
+        for folder, file_path, st in entries:
+            if stat.S_ISLNK(st.st_mode):
+                manifest["links"][_archive_names(folder, file_path)[0]] = os.readlink(file_path)
+        total_bytes = sum(st.st_size for _, _, st in files) or 1
+        bytes_done = 0
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            pending = []
+            for folder, file_path, st in files:
+                rel_path, short_path = _archive_names(folder, file_path)
+                checksum = None
+                if rel_path in previous:
+                    checksum, size, previous_mtime, _ = _manifest_entry(previous[rel_path])
+                    if (size != st.st_size or previous_mtime != st.st_mtime_ns
+                            or not os.path.exists(_object_path(objects_dir, checksum))):
+                        checksum = None
+                if checksum is None:
+                    checksum = pool.submit(_store_object, objects_dir, file_path, self.gzip_level)
+                pending.append((rel_path, short_path, st, checksum))
+
+            for rel_path, short_path, st, checksum in pending:
+                if not isinstance(checksum, str):
+                    checksum = checksum.result()
+                manifest["files"][rel_path] = (checksum, st.st_size, st.st_mtime_ns, stat.S_IMODE(st.st_mode))
+                bytes_done += st.st_size
+                self.report(f"Adding: {short_path}", int(bytes_done * 100 / total_bytes))
+
+        tmp_file = backup_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+        os.replace(tmp_file, backup_file)
+        return manifest
+
+    def build_manifest(self, entries):
+        manifest = {
+            "created": datetime.datetime.now().isoformat(),
+            "folders": self.folders,
+            "checksum_algo": self.checksum_algo,
+            "files": {}
+        }
+        files = [(*_archive_names(folder, file_path), file_path, st)
+                 for folder, file_path, st in entries if stat.S_ISREG(st.st_mode)]
+        if not self.calculate_checksums:
+            for rel_path, _, _, st in files:
+                manifest["files"][rel_path] = (None, st.st_size, st.st_mtime_ns)
+            return manifest
+
+        self.status.emit("Calculating checksums...")
+        total_bytes = sum(st.st_size for _, _, _, st in files) or 1
+        bytes_done = 0
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            results = pool.map(lambda path: self.app.checksum_with_stat(path, self.checksum_algo),
+                               (path for _, _, path, _ in files))
+            for (rel_path, short_path, _, st), (checksum, hashed_st) in zip(files, results):
+                manifest["files"][rel_path] = (checksum, hashed_st.st_size, hashed_st.st_mtime_ns)
+                bytes_done += st.st_size
+                self.report(f"Checksumming: {short_path}", int(bytes_done * 50 / total_bytes))
+        return manifest
+
+    def write_archive(self, tar, entries, manifest):
+        _add_manifest(tar, manifest)
+
+        total_bytes = sum(st.st_size for _, _, st in entries) or 1
+        bytes_done = 0
+        start = 50 if self.calculate_checksums else 0
+        changed = {}
+        read_q = queue.Queue(maxsize=READ_AHEAD_QUEUE)
+        stop = threading.Event()
+        reader = threading.Thread(target=self.read_ahead, args=(tar, entries, manifest, read_q, stop),
+                                  daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = read_q.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                short_path, st, tarinfo, fileobj, rehash = item
+                try:
+                    if tarinfo is not None:
+                        tar.addfile(tarinfo, fileobj)
+                finally:
+                    if fileobj is not None:
+                        fileobj.close()
+                if rehash:
+                    hasher, mtime = rehash
+                    changed[tarinfo.name] = (hasher.hexdigest(), tarinfo.size, mtime)
+
+                bytes_done += st.st_size
+                self.report(f"Adding: {short_path}", start + int(bytes_done * (100 - start) / total_bytes))
+        finally:
+            stop.set()
+            while reader.is_alive() or not read_q.empty():
+                try:
+                    item = read_q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if isinstance(item, tuple) and item[3] is not None:
+                    item[3].close()
+            reader.join()
+
+        if changed:
+            # Files modified after their checksum pass get a trailing manifest with fresh checksums.
+            manifest["files"].update(changed)
+            _add_manifest(tar, manifest)
+
+    def read_ahead(self, tar, entries, manifest, read_q, stop):
+        try:
+            for folder, file_path, st in entries:
+                if stop.is_set():
+                    return
+                rel_path, short_path = _archive_names(folder, file_path)
+                fileobj = hasher = rehash = None
+                tarinfo = _tarinfo(file_path, rel_path, st)
+                if tarinfo is None:
+                    tarinfo = tar.gettarinfo(file_path, arcname=rel_path)
+                elif tarinfo.isfile():
+                    fileobj = open(file_path, 'rb')
+                    try:
+                        fst = os.fstat(fileobj.fileno())
+                        tarinfo.size = fst.st_size
+                        tarinfo.mtime = fst.st_mtime
+                        checksum, size, mtime = manifest["files"][rel_path]
+                        if checksum and (size, mtime) != (fst.st_size, fst.st_mtime_ns):
+                            logging.warning(f"{file_path} changed after its checksum was calculated, re-hashing")
+                            hasher = HASHERS[manifest["checksum_algo"]]()
+                            rehash = (hasher, fst.st_mtime_ns)
+                        if tarinfo.size <= READ_AHEAD_LIMIT:
+                            data = fileobj.read(tarinfo.size)
+                            fileobj.close()
+                            tarinfo.size = len(data)
+                            fileobj = io.BytesIO(data)
+                            if hasher:
+                                hasher.update(data)
+                        else:
+                            fileobj = _FixedSizeReader(fileobj, tarinfo.size, file_path, hasher)
+                    except Exception:
+                        fileobj.close()
+                        raise
+                read_q.put((short_path, st, tarinfo, fileobj, rehash))
+            read_q.put(None)
+        except Exception as e:
+            read_q.put(e)
 
+class RestoreWorker(WorkerThread):
     def __init__(self, app, backup_file, restore_dest, verify_checksums, overwrite):
         super().__init__()
         self.app = app
@@ -108,50 +556,10 @@ class RestoreWorker(QThread):
             self.status.emit(f"Starting restore from {self.backup_file}...")
             self.progress.emit(0)
 
-            manifest = None
-            with tarfile.open(self.backup_file, "r:gz") as tar:
-                try:
-                    manifest_file = tar.extractfile("manifest.json")
-                    manifest = json.loads(manifest_file.read().decode())
-                except KeyError:
-                    self.app.logger.warning("No manifest found in backup archive")
-
-            total_files = 0
-            with tarfile.open(self.backup_file, "r:gz") as tar:
-                total_files = sum(1 for member in tar.getmembers() if member.isfile())
-
-            processed_files = 0
-
-            with tarfile.open(self.backup_file, "r:gz") as tar:
-                for member in tar.getmembers():
-                    if member.name == "manifest.json":
-                        continue
-                    if not member.isfile():
-                        continue
-
-                    dest_path = os.path.join(self.restore_dest, member.name)
-                    dest_dir = os.path.dirname(dest_path)
-                    os.makedirs(dest_dir, exist_ok=True)
-
-                    if os.path.exists(dest_path) and not self.overwrite:
-                        self.app.logger.info(f"Skipping existing file: {dest_path}")
-                        processed_files += 1
-                        progress = int(processed_files / total_files * 100)
-                        self.progress.emit(progress)
-                        continue
-
-                    self.status.emit(f"Restoring: {member.name}")
-                    tar.extract(member, path=self.restore_dest)
-
-                    if self.verify_checksums and manifest and member.name in manifest["files"]:
-                        restored_checksum = self.app.calculate_checksum(dest_path)
-                        original_checksum = manifest["files"][member.name]["checksum"]
-                        if restored_checksum != original_checksum:
-                            raise Exception(f"Checksum verification failed for {member.name}")
-
-                    processed_files += 1
-                    progress = int(processed_files / total_files * 100)
-                    self.progress.emit(progress)
+            if self.backup_file.endswith(SNAPSHOT_EXTENSION):
+                self.restore_snapshot()
+            else:
+                self.restore_archive()
 
             self.progress.emit(100)
             self.completed.emit(f"Restore completed to {self.restore_dest}")
@@ -159,6 +567,108 @@ class RestoreWorker(QThread):
             error_msg = f"Restore failed: {str(e)}"
             self.error.emit(error_msg)
 
+    def restore_archive(self):
+        manifest = None
+        total_bytes = 0
+        bytes_done = 0
+        indeterminate = False
+        verify = self.verify_checksums
+        unverified = []
+
+        with _open_backup(self.backup_file) as tar:
+            for member in tar:
+                if member.name == "manifest.json":
+                    manifest = json.loads(tar.extractfile(member).read().decode())
+                    verify = verify and self.can_verify(manifest)
+                    total_bytes = sum(_manifest_entry(entry)[1] for entry in manifest["files"].values())
+                    continue
+                if not member.isfile():
+                    continue
+                if not total_bytes and not indeterminate:
+                    indeterminate = True
+                    self.progress.emit(-1)
+
+                dest_path = os.path.join(self.restore_dest, member.name)
+                dest_dir = os.path.dirname(dest_path)
+                os.makedirs(dest_dir, exist_ok=True)
+
+                if os.path.exists(dest_path) and not self.overwrite:
+                    self.app.logger.info(f"Skipping existing file: {dest_path}")
+                else:
+                    tar.extract(member, path=self.restore_dest)
+                    if verify and not (manifest and self.checksum_matches(manifest, member.name)):
+                        unverified.append(member.name)
+
+                bytes_done += member.size
+                self.report(f"Restoring: {member.name}",
+                            min(int(bytes_done * 100 / total_bytes), 100) if total_bytes else None)
+
+        if manifest is None:
+            self.app.logger.warning("No manifest found in backup archive")
+        elif verify:
+            for name in unverified:
+                self.verify_checksum(manifest, name)
+
+    def restore_snapshot(self):
+        with open(self.backup_file, 'r') as f:
+            manifest = json.load(f)
+        verify = self.verify_checksums and self.can_verify(manifest)
+        objects_dir = os.path.join(os.path.dirname(self.backup_file), OBJECTS_DIR)
+        total_bytes = sum(_manifest_entry(entry)[1] for entry in manifest["files"].values()) or 1
+        bytes_done = 0
+
+        for name, entry in manifest["files"].items():
+            checksum, size, mtime, mode = _manifest_entry(entry)
+            dest_path = os.path.join(self.restore_dest, name)
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+
+            if os.path.exists(dest_path) and not self.overwrite:
+                self.app.logger.info(f"Skipping existing file: {dest_path}")
+            else:
+                with gzip.open(_object_path(objects_dir, checksum), 'rb') as src, \
+                        open(dest_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFSIZE)
+                if mode is not None:
+                    os.chmod(dest_path, mode)
+                os.utime(dest_path, ns=(mtime, mtime))
+                if verify:
+                    self.verify_checksum(manifest, name)
+
+            bytes_done += size
+            self.report(f"Restoring: {name}", int(bytes_done * 100 / total_bytes))
+
+        for name, target in manifest.get("links", {}).items():
+            dest_path = os.path.join(self.restore_dest, name)
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            if os.path.lexists(dest_path):
+                if not self.overwrite:
+                    self.app.logger.info(f"Skipping existing file: {dest_path}")
+                    continue
+                os.remove(dest_path)
+            os.symlink(target, dest_path)
+
+    def can_verify(self, manifest):
+        algo = manifest.get("checksum_algo", "sha256")
+        if algo in HASHERS:
+            return True
+        self.app.logger.warning(f"Checksum algorithm {algo} is not available, skipping verification")
+        return False
+
+    def verify_checksum(self, manifest, name):
+        if not self.checksum_matches(manifest, name):
+            raise Exception(f"Checksum verification failed for {name}")
+
+    def checksum_matches(self, manifest, name):
+        if name not in manifest["files"]:
+            return True
+        original_checksum = _manifest_entry(manifest["files"][name])[0]
+        if not original_checksum:
+            return True
+        restored_checksum = self.app.calculate_checksum(os.path.join(self.restore_dest, name),
+                                                        manifest.get("checksum_algo", "sha256"),
+                                                        use_cache=False)
+        return restored_checksum == original_checksum
+
 class BackupRestoreApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -176,6 +686,9 @@ class BackupRestoreApp(QMainWindow):
             handlers=[logging.FileHandler(log_file), logging.StreamHandler()]
         )
         self.logger = logging
+        self.checksum_cache = ChecksumCache(
+            os.path.join(os.path.expanduser("~"), ".backup_restore_hashcache.sqlite"))
+        self.backup_lock = threading.Lock()
         self.folder_paths = self.config.get("folders", [])
         self.init_ui()
 
@@ -236,15 +749,25 @@ class BackupRestoreApp(QMainWindow):
         name_layout.addWidget(self.backup_name_edit)
         options_layout.addLayout(name_layout)
         comp_layout = QHBoxLayout()
-        comp_layout.addWidget(QLabel("Compression Level:"))
-        self.compression_slider = QSlider(Qt.Horizontal)
-        self.compression_slider.setRange(1, 9)
-        self.compression_slider.setValue(self.config.get("compression_level", 6))
-        comp_layout.addWidget(self.compression_slider)
+        comp_layout.addWidget(QLabel("Compression:"))
+        self.compression_combo = QComboBox()
+        self.compression_combo.addItems(list(COMPRESSION_PRESETS))
+        self.compression_combo.setCurrentText(self.config.get("compression_preset", DEFAULT_COMPRESSION_PRESET))
+        comp_layout.addWidget(self.compression_combo)
         options_layout.addLayout(comp_layout)
         self.checksum_check = QCheckBox("Calculate Checksums")
         self.checksum_check.setChecked(self.config.get("calculate_checksums", True))
         options_layout.addWidget(self.checksum_check)
+        algo_layout = QHBoxLayout()
+        algo_layout.addWidget(QLabel("Checksum Algorithm:"))
+        self.checksum_algo_combo = QComboBox()
+        self.checksum_algo_combo.addItems(sorted(HASHERS))
+        self.checksum_algo_combo.setCurrentText(self.config.get("checksum_algo", DEFAULT_CHECKSUM_ALGO))
+        algo_layout.addWidget(self.checksum_algo_combo)
+        options_layout.addLayout(algo_layout)
+        self.incremental_check = QCheckBox("Incremental Backup (store only changed files)")
+        self.incremental_check.setChecked(self.config.get("incremental_backups", False))
+        options_layout.addWidget(self.incremental_check)
         layout.addWidget(options_frame)
 
         start_btn = QPushButton("Start Backup")
@@ -381,8 +904,10 @@ class BackupRestoreApp(QMainWindow):
                 pass
         return {
             "last_backup_destination": os.path.expanduser("~/Backups"),
-            "compression_level": 6,
+            "compression_preset": DEFAULT_COMPRESSION_PRESET,
             "calculate_checksums": True,
+            "checksum_algo": DEFAULT_CHECKSUM_ALGO,
+            "incremental_backups": False,
             "scheduled_backups": False,
             "backup_frequency": "daily",
             "retention_count": 5,
@@ -394,8 +919,10 @@ class BackupRestoreApp(QMainWindow):
 
     def save_config(self):
         self.config["last_backup_destination"] = self.dest_edit.text()
-        self.config["compression_level"] = self.compression_slider.value()
+        self.config["compression_preset"] = self.compression_combo.currentText()
         self.config["calculate_checksums"] = self.checksum_check.isChecked()
+        self.config["checksum_algo"] = self.checksum_algo_combo.currentText()
+        self.config["incremental_backups"] = self.incremental_check.isChecked()
         self.config["scheduled_backups"] = self.schedule_check.isChecked()
         self.config["backup_frequency"] = self.frequency_combo.currentText()
         self.config["retention_count"] = self.retention_spin.value()
@@ -438,7 +965,7 @@ class BackupRestoreApp(QMainWindow):
 
     def select_backup_file(self):
         file, _ = QFileDialog.getOpenFileName(
-            self, "Select Backup File", "", "Backup Files (*.tar.gz);;All Files (*.*)"
+            self, "Select Backup File", "", "Backup Files (*.tar.gz *.tar.zst *.snapshot.json);;All Files (*.*)"
         )
         if file:
             self.restore_path_edit.setText(file)
@@ -460,22 +987,42 @@ class BackupRestoreApp(QMainWindow):
             file_date = datetime.datetime.fromtimestamp(os.path.getmtime(backup_file))
             info_text = f"File: {os.path.basename(backup_file)}\n"
             info_text += f"Size: {file_size_mb:.2f} MB\n"
-            info_text += f"Date: {file_date}\n\n"
-            info_text += "Contents:\n"
-            with tarfile.open(backup_file, "r:gz") as tar:
-                top_dirs = set()
-                for member in tar.getmembers():
-                    if '/' in member.name:
-                        top_dir = member.name.split('/')[0]
-                        top_dirs.add(top_dir)
-                    else:
-                        top_dirs.add(member.name)
-                for dir_name in sorted(top_dirs):
-                    info_text += f"- {dir_name}\n"
+            info_text += f"Date: {file_date}\n"
+            index = self.load_backup_index(backup_file)
+            if index:
+                info_text += f"Files: {index['files']} ({index['size'] / (1024 * 1024):.2f} MB uncompressed)\n"
+                top_dirs = index["top_dirs"]
+            else:
+                top_dirs = self.scan_top_dirs(backup_file)
+            info_text += "\nContents:\n"
+            for dir_name in sorted(top_dirs):
+                info_text += f"- {dir_name}\n"
             self.info_text.append(info_text)
         except Exception as e:
             self.info_text.append(f"Error reading backup file: {str(e)}")
 
+    def load_backup_index(self, backup_file):
+        try:
+            with open(backup_file + INDEX_SUFFIX, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def scan_top_dirs(self, backup_file):
+        if backup_file.endswith(SNAPSHOT_EXTENSION):
+            with open(backup_file, 'r') as f:
+                return {Path(folder).name for folder in json.load(f)["folders"]}
+        top_dirs = set()
+        with _open_backup(backup_file) as tar:
+            for member in tar:
+                if member.name == "manifest.json":
+                    if not top_dirs:
+                        manifest = json.loads(tar.extractfile(member).read().decode())
+                        return {Path(folder).name for folder in manifest["folders"]}
+                    continue
+                top_dirs.add(member.name.split('/')[0])
+        return top_dirs
+
     def toggle_schedule_options(self):
         enabled = self.schedule_check.isChecked()
         self.schedule_options.setEnabled(enabled)
@@ -493,9 +1040,7 @@ class BackupRestoreApp(QMainWindow):
         self.log_text.clear()
         try:
             if os.path.exists(log_file):
-                with open(log_file, 'r') as f:
-                    lines = f.readlines()[-1000:]
-                    self.log_text.append(''.join(lines))
+                self.log_text.append(_tail_lines(log_file, 1000))
             else:
                 self.log_text.append("No log file found.")
             self.log_text.verticalScrollBar().setValue(
@@ -530,12 +1075,22 @@ class BackupRestoreApp(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export logs: {str(e)}")
 
-    def calculate_checksum(self, file_path):
-        hasher = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+    def calculate_checksum(self, file_path, algo=None, use_cache=True):
+        return self.checksum_with_stat(file_path, algo, use_cache)[0]
+
+    def checksum_with_stat(self, file_path, algo=None, use_cache=True):
+        algo = algo or self.config.get("checksum_algo", DEFAULT_CHECKSUM_ALGO)
+        cache_key = os.path.abspath(file_path)
+        with open(file_path, 'rb', buffering=0) as f:
+            st = os.fstat(f.fileno())
+            if use_cache:
+                checksum = self.checksum_cache.get(cache_key, algo, st)
+                if checksum:
+                    return checksum, st
+            checksum = _hash_file(f, algo)
+        if use_cache:
+            self.checksum_cache.put(cache_key, algo, st, checksum)
+        return checksum, st
 
     def start_backup(self):
         if not self.folder_paths:
@@ -553,9 +1108,10 @@ class BackupRestoreApp(QMainWindow):
                 return
         self.backup_worker = BackupWorker(
             self, self.backup_name_edit.text(), backup_dest, self.folder_paths,
-            self.compression_slider.value(), self.checksum_check.isChecked()
+            self.compression_combo.currentText(), self.checksum_check.isChecked(),
+            self.incremental_check.isChecked(), self.checksum_algo_combo.currentText()
         )
-        self.backup_worker.progress.connect(self.progress_bar.setValue)
+        self.backup_worker.progress.connect(self.update_progress)
         self.backup_worker.status.connect(self.status_label.setText)
         self.backup_worker.error.connect(
             lambda msg: QMessageBox.critical(self, "Backup Failed", msg) if self.notify_failure_check.isChecked() else None)
@@ -585,7 +1141,7 @@ class BackupRestoreApp(QMainWindow):
         self.restore_worker = RestoreWorker(
             self, backup_file, restore_dest, self.verify_check.isChecked(), self.overwrite_check.isChecked()
         )
-        self.restore_worker.progress.connect(self.progress_bar.setValue)
+        self.restore_worker.progress.connect(self.update_progress)
         self.restore_worker.status.connect(self.status_label.setText)
         self.restore_worker.error.connect(
             lambda msg: QMessageBox.critical(self, "Restore Failed", msg) if self.notify_failure_check.isChecked() else None)
@@ -593,6 +1149,13 @@ class BackupRestoreApp(QMainWindow):
             lambda msg: QMessageBox.information(self, "Restore Complete", msg) if self.notify_success_check.isChecked() else None)
         self.restore_worker.start()
 
+    def update_progress(self, value):
+        if value < 0:
+            self.progress_bar.setMaximum(0)
+        else:
+            self.progress_bar.setMaximum(100)
+            self.progress_bar.setValue(value)
+
     def start_scheduler(self):
         if not self.schedule_check.isChecked():
             return
@@ -620,7 +1183,8 @@ class BackupRestoreApp(QMainWindow):
     def perform_backup(self):
         worker = BackupWorker(
             self, self.backup_name_edit.text(), self.dest_edit.text(), self.folder_paths,
-            self.compression_slider.value(), self.checksum_check.isChecked()
+            self.compression_combo.currentText(), self.checksum_check.isChecked(),
+            self.incremental_check.isChecked(), self.checksum_algo_combo.currentText()
         )
         worker.run()
 
@@ -630,33 +1194,69 @@ class BackupRestoreApp(QMainWindow):
         retention_unit = self.retention_unit_combo.currentText()
         if not os.path.exists(backup_dest):
             return
-        backup_files = [f for f in os.listdir(backup_dest) if f.endswith('.tar.gz')]
-        if not backup_files:
+        with os.scandir(backup_dest) as it:
+            backups = [(entry, entry.stat().st_mtime) for entry in it if entry.name.endswith(BACKUP_EXTENSIONS)]
+        if not backups:
             return
-        backup_files.sort(
-            key=lambda x: os.path.getmtime(os.path.join(backup_dest, x)), reverse=True
-        )
+        backups.sort(key=lambda backup: backup[1], reverse=True)
         if retention_unit == "backups":
-            for old_backup in backup_files[retention_count:]:
+            for entry, _ in backups[retention_count:]:
                 try:
-                    os.remove(os.path.join(backup_dest, old_backup))
-                    self.logger.info(f"Removed old backup: {old_backup}")
+                    self.remove_backup(entry.path)
+                    self.logger.info(f"Removed old backup: {entry.name}")
                 except Exception as e:
-                    self.logger.error(f"Failed to remove old backup {old_backup}: {str(e)}")
+                    self.logger.error(f"Failed to remove old backup {entry.name}: {str(e)}")
         else:
-            now = datetime.datetime.now()
             time_units = {"days": 1, "weeks": 7, "months": 30}
             cutoff_days = retention_count * time_units[retention_unit]
-            cutoff_time = now - datetime.timedelta(days=cutoff_days)
-            for backup_file in backup_files:
-                file_path = os.path.join(backup_dest, backup_file)
-                file_mtime = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-                if file_mtime < cutoff_time:
+            cutoff_ts = (datetime.datetime.now() - datetime.timedelta(days=cutoff_days)).timestamp()
+            for entry, mtime in backups:
+                if mtime < cutoff_ts:
                     try:
-                        os.remove(file_path)
-                        self.logger.info(f"Removed old backup: {backup_file}")
+                        self.remove_backup(entry.path)
+                        self.logger.info(f"Removed old backup: {entry.name}")
                     except Exception as e:
-                        self.logger.error(f"Failed to remove old backup {backup_file}: {str(e)}")
+                        self.logger.error(f"Failed to remove old backup {entry.name}: {str(e)}")
+        self.prune_objects(backup_dest)
+
+    def remove_backup(self, backup_file):
+        os.remove(backup_file)
+        if os.path.exists(backup_file + INDEX_SUFFIX):
+            os.remove(backup_file + INDEX_SUFFIX)
+
+    def load_latest_snapshot(self, backup_dest):
+        snapshots = [os.path.join(backup_dest, f) for f in os.listdir(backup_dest)
+                     if f.endswith(SNAPSHOT_EXTENSION)]
+        if not snapshots:
+            return {}
+        try:
+            with open(max(snapshots, key=os.path.getmtime), 'r') as f:
+                return json.load(f)["files"]
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring unreadable snapshot: {str(e)}")
+            return {}
+
+    def prune_objects(self, backup_dest):
+        objects_dir = os.path.join(backup_dest, OBJECTS_DIR)
+        if not os.path.isdir(objects_dir):
+            return
+        referenced = set()
+        try:
+            for name in os.listdir(backup_dest):
+                if name.endswith(SNAPSHOT_EXTENSION):
+                    with open(os.path.join(backup_dest, name), 'r') as f:
+                        referenced.update(_manifest_entry(entry)[0] for entry in json.load(f)["files"].values())
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Skipping object pruning, unreadable snapshot: {str(e)}")
+            return
+        for path, _ in _walk(objects_dir):
+            digest = os.path.basename(os.path.dirname(path)) + os.path.basename(path)
+            if os.path.basename(path).startswith(".tmp-") or digest in referenced:
+                continue
+            try:
+                os.remove(path)
+            except Exception as e:
+                self.logger.error(f"Failed to remove unreferenced object {digest}: {str(e)}")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)